@@ -10,18 +10,17 @@ class NPID(object):
     def __init__(self, num_joints):
         # Initialize arrays to store the gains and constraints for all joints
         self.num_joints = num_joints
-        self.k_p = np.zeros(num_joints).reshape((self.num_joints, 1))
-        self.k_i = np.zeros(num_joints).reshape((self.num_joints, 1))
-        self.k_d = np.zeros(num_joints).reshape((self.num_joints, 1))
-        self.i_clamp = np.zeros(num_joints).reshape((self.num_joints, 1))
-        self.k_ff = np.zeros(num_joints).reshape((self.num_joints, 1))
+        self.k_p = np.zeros(num_joints)
+        self.k_i = np.zeros(num_joints)
+        self.k_d = np.zeros(num_joints)
+        self.i_clamp = np.zeros(num_joints)
+        self.k_ff = np.zeros(num_joints)
         # self.max_velocity = np.full(num_joints, np.inf)  # Default to no velocity limit
 
         # Initialize arrays for storing the integral term and previous errors
-        self.integral_term = np.zeros(num_joints).reshape((self.num_joints, 1))
-        self.previous_position = np.zeros(num_joints).reshape((self.num_joints, 1))
+        self.integral_term = np.zeros(num_joints)
+        self.previous_position = np.zeros(num_joints)
         self._last_time = None
-        self.previous_position = np.zeros((num_joints, 1))
         self.i = 0
 
     @property
@@ -30,10 +29,10 @@ class NPID(object):
        return self._last_time
 
     def update_gains(self, k_p, k_i, k_d, i_clamp, k_ff):
-        # Update the gains for all joints
-        self.k_p = k_p
-        self.k_i = k_i
-        self.k_d = k_d
+        # Update the gains for all joints, stored as flat vectors
+        self.k_p = np.ravel(k_p)
+        self.k_i = np.ravel(k_i)
+        self.k_d = np.ravel(k_d)
         self.i_clamp = i_clamp
         self.k_ff = k_ff
 
@@ -60,7 +59,7 @@ class NPID(object):
         # logger.info(f'pos err: {pe_str}')
 
         if dt == 0 or math.isnan(dt) or math.isinf(dt):
-            return np.zeros(len(self.k_p)).reshape((self.num_joints, 1))
+            return np.zeros(self.num_joints)
         if is_continuous:
             position_error = np.arctan2(np.sin(position_error), np.cos(position_error))
 
@@ -93,7 +92,10 @@ class NPID(object):
         # Store the current error as previous error for the next iteration
         self.previous_error = position_error
 
-        self.previous_position = measured_position
+        # Snapshot into the preallocated array: callers reuse their
+        # position buffer between ticks, so keeping a reference would
+        # alias it and zero the velocity error above.
+        np.copyto(self.previous_position, measured_position)
 
         # self.i += 1
         # if self.i >= 50:
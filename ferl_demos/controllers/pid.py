@@ -6,12 +6,37 @@ control_toolbox Pid class: http://ros.org/wiki/control_toolbox.
 """
 
 import time
-import math
 import numpy as np
 
+try:
+    import numba as nb
+    _njit = nb.njit(cache=True, fastmath=True)
+except ImportError:
+    # Numba is optional; without it the kernel runs as plain NumPy.
+    def _njit(func):
+        return func
+
 from rclpy.impl import rcutils_logger
 logger = rcutils_logger.RcutilsLogger(name="pid")
 
+
+@_njit
+def _pid_step(p_err, p_err_last, i_err, d_err, cmd, p_gain, i_gain, d_gain,
+              i_min, i_max, dt):
+    """ Compiled PID arithmetic over flat float32 arrays.
+
+    Updates i_err, d_err and cmd in place so the 500 Hz caller never
+    allocates small-array temporaries. Kept module-level so Numba can
+    compile it once and the caller pays no dispatch overhead.
+    """
+    inv_dt = 1.0 / dt
+    for j in range(p_err.shape[0]):
+        # Branchless clamp bounds the integrator (anti-windup) and keeps
+        # it away from denormal/overflow territory.
+        i_err[j] = min(max(i_err[j] + dt * p_err[j], i_min), i_max)
+        d_err[j] = (p_err[j] - p_err_last[j]) * inv_dt
+        cmd[j] = p_gain[j] * p_err[j] + i_gain[j] * i_err[j] + d_gain[j] * d_err[j]
+
 #*******************************************************************
 # Translated from pid.cpp by Nathan Sprague
 # Jan. 2013 (Modified Jan. 2014)
@@ -78,34 +103,46 @@ class PID(object):
     $ p_{error} = p_{target} - p_{state} $.
     """
 
-    def __init__(self, p_gain, i_gain, d_gain, i_min, i_max):
+    def __init__(self, p_gain, i_gain, d_gain, i_min, i_max, min_dt=1e-4):
         """
         Constructor, zeros out Pid values when created and
-        initialize Pid-gains and integral term limits. All gains are 
-		7x7 matrices.
+        initialize Pid-gains and integral term limits. All state is
+        kept as flat (num_dofs,) vectors.
 
         Parameters:
           p_gain     The proportional gain.
           i_gain     The integral gain.
           d_gain     The derivative gain.
-          i_min      The integral lower limit. 
+          i_min      The integral lower limit.
           i_max      The integral upper limit.
+          min_dt     Steps shorter than this hold the previous command.
         """
         # TODO Generalize this to num_dofs
         self.num_dofs = 6
+        self._min_dt = min_dt
         self.set_gains(p_gain, i_gain, d_gain, i_min, i_max)
         self.reset()
         self.i = 0
 
+        # Warm-start the compiled kernel so JIT compilation cost is paid
+        # here rather than on the first control tick. The state is all
+        # zeros, so running one dummy step leaves it unchanged.
+        _pid_step(self._p_error, self._p_error_last, self._i_error,
+                  self._d_error, self._cmd, self._p_gain_flat,
+                  self._i_gain_flat, self._d_gain_flat,
+                  float(self._i_min), float(self._i_max), 1.0)
+
     def reset(self):
         """ Reset the state of this PID controller """
-        self._p_error_last = np.zeros((self.num_dofs,1)) # Save position state for derivative
+        # float32 state: joint velocities carry ~3 useful decimals, and
+        # halving the bytes halves the load/store traffic in the kernel.
+        self._p_error_last = np.zeros(self.num_dofs, dtype=np.float32) # Save position state for derivative
                                  # state calculation.
-        self._p_error = np.zeros((self.num_dofs,1))  # Position error.
-        self._d_error = np.zeros((self.num_dofs,1))  # Derivative error.
-        self._i_error = np.zeros((self.num_dofs,1))  # Integator error.
-        self._cmd = np.zeros((self.num_dofs,self.num_dofs))  # Command to send.
-        self._last_time = None # Used for automatic calculation of dt.
+        self._p_error = np.zeros(self.num_dofs, dtype=np.float32)  # Position error.
+        self._d_error = np.zeros(self.num_dofs, dtype=np.float32)  # Derivative error.
+        self._i_error = np.zeros(self.num_dofs, dtype=np.float32)  # Integator error.
+        self._cmd = np.zeros(self.num_dofs, dtype=np.float32)  # Command to send.
+        self._last_time_ns = None # Used for automatic calculation of dt.
         
     def set_gains(self, p_gain, i_gain, d_gain, i_min, i_max): 
         """ 
@@ -124,6 +161,12 @@ class PID(object):
         self._i_min = i_min
         self._i_max = i_max
 
+        # Flat float32 copies handed to the compiled kernel, so its
+        # specialization stays stable regardless of the caller's shapes.
+        self._p_gain_flat = np.ravel(np.asarray(p_gain, dtype=np.float32))
+        self._i_gain_flat = np.ravel(np.asarray(i_gain, dtype=np.float32))
+        self._d_gain_flat = np.ravel(np.asarray(d_gain, dtype=np.float32))
+
     @property
     def p_gain(self):
         """ Read-only access to p_gain. """
@@ -171,8 +214,8 @@ class PID(object):
 
     @property
     def last_time(self):
-       """ Read-only access to the last time. """
-       return self._last_time
+       """ Read-only access to the last time, in nanoseconds. """
+       return self._last_time_ns
 
     def __str__(self):
         """ String representation of the current state of the controller. """
@@ -194,45 +237,38 @@ class PID(object):
         Update the PID loop with nonuniform time step size.
 
         Parameters:
-          p_error  Error since last call (target - state)
-          dt       Change in time since last call, in seconds, or None. 
-                   If dt is None, then the system clock will be used to 
-                   calculate the time since the last update. 
+          p_error  Error since last call (target - state), as a flat
+                   (num_dofs,) array.
+          dt       Change in time since last call, in seconds, or None.
+                   If dt is None, then the system clock will be used to
+                   calculate the time since the last update.
         """
 
         if dt == None:
-            cur_time = time.time()
-            if self._last_time is None:
-                self._last_time = cur_time 
-            dt = cur_time - self._last_time
-            self._last_time = cur_time
-
-        self._p_error = p_error
-        if dt == 0 or math.isnan(dt) or math.isinf(dt):
-            return np.zeros((self.num_dofs,self.num_dofs))
-
-        # Calculate proportional contribution to command
-        p_term = self._p_gain * self._p_error
-        # p_str = np.array2string(p_term)
-        # logger.info(f"p: {p_str}")
-		
-        # Calculate the integral error
-        self._i_error += dt * self._p_error 
-        
-        # Calculate integral contribution to command
-        i_term = self._i_gain * self._i_error
-        # i_str = np.array2string(i_term)
-        # logger.info(f"i: {i_str}")
-        
-        # Calculate the derivative error
-        self._d_error = (self._p_error - self._p_error_last) / dt
-        self._p_error_last = self._p_error
-
-        # Calculate derivative contribution to command 
-        d_term = self._d_gain * self._d_error
-        # d_str = np.array2string(d_term)
-        # logger.info(f"d: {d_str}\n")
-        
-        self._cmd = p_term + i_term + d_term
-        # self._cmd = np.eye(self.num_dofs) * dt * p_error
+            # Monotonic integer nanoseconds: immune to the NTP steps
+            # that made wall-clock dt go negative or huge.
+            now = time.monotonic_ns()
+            if self._last_time_ns is None:
+                self._last_time_ns = now
+            dt = (now - self._last_time_ns) * 1e-9
+            self._last_time_ns = now
+
+        # Cast into the float32 state array: callers compute the error
+        # in float64, and handing that to the kernel would JIT a second
+        # mixed-dtype specialization on the first real tick, wasting
+        # the warm start done in __init__.
+        np.copyto(self._p_error, p_error)
+        if dt < self._min_dt:
+            # Sub-threshold steps amplify derivative noise and cost a
+            # full update; hold the previous command instead.
+            return self._cmd
+
+        # All of the arithmetic lives in the compiled kernel; this
+        # wrapper only handles timing and state bookkeeping. The state
+        # arrays are updated in place, so nothing is allocated here.
+        _pid_step(self._p_error, self._p_error_last, self._i_error,
+                  self._d_error, self._cmd, self._p_gain_flat,
+                  self._i_gain_flat, self._d_gain_flat,
+                  float(self._i_min), float(self._i_max), dt)
+        np.copyto(self._p_error_last, self._p_error)
         return self._cmd
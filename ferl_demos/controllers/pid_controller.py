@@ -5,8 +5,8 @@ import rclpy
 from rclpy.impl import rcutils_logger
 logger = rcutils_logger.RcutilsLogger(name="pid")
 
-from ferl.controllers import pid
-from ferl.controllers import npid
+from ferl_demos.controllers import pid
+from ferl_demos.controllers import npid
 
 import numpy as np
 
@@ -29,13 +29,13 @@ class PIDController(object):
 		max_cmd    - maximum allowed torque command
 	"""
 
-	def __init__(self, P, I, D, epsilon, max_cmd):
+	def __init__(self, P, I, D, epsilon, max_cmd, min_dt=1e-4):
 		# TODO generalize
 		self.num_dofs = 6
 		# ----- PID Parameter Setup ----- #
 
 		# Basic PID controller initialization.
-		self.pid = pid.PID(P,I,D, -0.1, 0.1)
+		self.pid = pid.PID(P,I,D, -0.1, 0.1, min_dt)
 
 		self.npid = npid.NPID(self.num_dofs)
 		self.npid.update_gains(P, I, D, 0.1, 0.0)
@@ -44,7 +44,7 @@ class PIDController(object):
 		self.epsilon = epsilon
 
 		# Stores maximum COMMANDED joint torques.
-		self.max_cmd = max_cmd * np.eye(self.num_dofs)
+		self.max_cmd = max_cmd * np.ones(self.num_dofs)
 
 		# Tracks running time since beginning and end of the path.
 		self.path_start_T = None
@@ -62,8 +62,8 @@ class PIDController(object):
 		# 	logger.info(f"p: {p_str}")
 		# exit()
 
-		# Save the intermediate target configuration. 
-		self.target_pos = self.traj.waypts[0].reshape((self.num_dofs,1))
+		# Save the intermediate target configuration.
+		self.target_pos = np.ravel(self.traj.waypts[0])
 
 	def get_command(self, current_pos, current_vel):
 		"""
@@ -82,7 +82,7 @@ class PIDController(object):
 		# First update the target position if needed.
 		# Check if the arm is at the start of the path to execute.
 		if self.path_start_T is None:
-			dist_from_start = current_pos - self.traj.waypts[0].reshape((self.num_dofs,1))
+			dist_from_start = current_pos - np.ravel(self.traj.waypts[0])
 			dist_from_start = np.fabs(dist_from_start)
 			dist_from_start_str = np.array2string(dist_from_start)
 			# logger.info(f"d2s: {dist_from_start_str}")
@@ -95,13 +95,13 @@ class PIDController(object):
 			t = time.time() - self.path_start_T
 
 			# Get next target position from position along trajectory.
-			self.target_pos = self.traj.interpolate(t + 0.1)
+			self.target_pos = np.ravel(self.traj.interpolate(t + 0.1))
 			# target_str = np.array2string(self.target_pos.reshape((1,-1)))
 			# logger.info(f"target: {target_str}")
 
 			# Check if the arm reached the goal.
 			if self.path_end_T is None:
-				dist_from_goal = current_pos - self.traj.waypts[-1].reshape((self.num_dofs,1))
+				dist_from_goal = current_pos - np.ravel(self.traj.waypts[-1])
 				dist_from_goal = np.fabs(dist_from_goal)
 
 				# Check if every joint is close enough to goal configuration.
@@ -115,15 +115,14 @@ class PIDController(object):
 		# err_str = np.array2string(np.array(error))
 		# logger.info(f"Error: {err_str}")
 		
-		# cmd = np.eye(self.num_dofs) * error
 		# cmd = self.pid.update_PID(error)
-		cmd = np.eye(self.num_dofs) * self.npid.calculate_control(current_pos, self.target_pos, current_vel)
+		cmd = self.npid.calculate_control(current_pos, self.target_pos, current_vel)
 
 		# Check if each angular torque is within set limits.
 		for i in range(self.num_dofs):
-			if cmd[i][i] > self.max_cmd[i][i]:
-				cmd[i][i] = self.max_cmd[i][i]
-			if cmd[i][i] < -self.max_cmd[i][i]:
-				cmd[i][i] = -self.max_cmd[i][i]
+			if cmd[i] > self.max_cmd[i]:
+				cmd[i] = self.max_cmd[i]
+			if cmd[i] < -self.max_cmd[i]:
+				cmd[i] = -self.max_cmd[i]
 
 		return cmd
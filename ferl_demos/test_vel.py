@@ -19,7 +19,7 @@ from geometry_msgs.msg import WrenchStamped, TwistStamped, Vector3
 from tf2_ros import Buffer, TransformListener, LookupException, ConnectivityException, ExtrapolationException
 from scipy.spatial.transform import Rotation as R
 
-from ferl.controllers.pid_controller import PIDController
+from ferl_demos.controllers.pid_controller import PIDController
 from ferl.planners.trajopt_planner import TrajoptPlanner
 from ferl.learners.phri_learner import PHRILearner
 from ferl.utils import ros2_utils, openrave_utils
@@ -27,23 +27,74 @@ from ferl.utils.environment import Environment
 from ferl.utils.trajectory import Trajectory
 
 import ast
+import json
 import numpy as np
 import threading
 
+try:
+    import numba as nb
+    _njit = nb.njit(cache=True)
+except ImportError:
+    # Numba is optional; without it the filter runs as plain Python.
+    def _njit(func):
+        return func
+
+# Interaction threshold on force/torque magnitude, compared squared so
+# the 500 Hz gate never needs a sqrt.
+_FT_THRESH_SQ = 3.0 * 3.0
+_ZERO_VEC3 = Vector3(x=0.0, y=0.0, z=0.0)
+
+
+@_njit
+def _filter_ft(fx, fy, fz, tx, ty, tz, thr2):
+    """
+    Filter both wrench vectors in one pass: zero whichever falls below
+    the squared threshold (or is NaN), and report whether the force is
+    large enough to count as an interaction.
+    """
+    sf = fx * fx + fy * fy + fz * fz
+    st = tx * tx + ty * ty + tz * tz
+    active = sf >= thr2 and sf == sf
+    if not active:
+        fx = fy = fz = 0.0
+    if st < thr2 or st != st:
+        tx = ty = tz = 0.0
+    return fx, fy, fz, tx, ty, tz, active
+
+
+@_njit
+def _wrench_step(Rm, fx, fy, fz, tx, ty, tz, prev_lin, prev_ang, inv_Kp, Kd, thr2):
+    """
+    One compiled step of the wrench loop: rotate the raw force/torque
+    into tool0, gate on squared magnitude, and apply the compliance law
+    against the previous twist. prev_lin/prev_ang are updated in place;
+    returns the interaction flag and the rotated force.
+    """
+    rfx = Rm[0, 0] * fx + Rm[0, 1] * fy + Rm[0, 2] * fz
+    rfy = Rm[1, 0] * fx + Rm[1, 1] * fy + Rm[1, 2] * fz
+    rfz = Rm[2, 0] * fx + Rm[2, 1] * fy + Rm[2, 2] * fz
+    rtx = Rm[0, 0] * tx + Rm[0, 1] * ty + Rm[0, 2] * tz
+    rty = Rm[1, 0] * tx + Rm[1, 1] * ty + Rm[1, 2] * tz
+    rtz = Rm[2, 0] * tx + Rm[2, 1] * ty + Rm[2, 2] * tz
+    rfx, rfy, rfz, rtx, rty, rtz, active = _filter_ft(rfx, rfy, rfz, rtx, rty, rtz, thr2)
+    if not active:
+        return False, rfx, rfy, rfz
+    prev_lin[0] = inv_Kp * rfx - Kd * prev_lin[0]
+    prev_lin[1] = inv_Kp * rfy - Kd * prev_lin[1]
+    prev_lin[2] = inv_Kp * rfz - Kd * prev_lin[2]
+    prev_ang[0] = inv_Kp * rtx - Kd * prev_ang[0]
+    prev_ang[1] = inv_Kp * rty - Kd * prev_ang[1]
+    prev_ang[2] = inv_Kp * rtz - Kd * prev_ang[2]
+    return True, rfx, rfy, rfz
+
 def convert_string_array_to_dict(string_array):
-    feat_range_dict = {}
-    for item in string_array:
-        key, value = item.split(':')
-        feat_range_dict[key] = float(value)  # Convert the value to a float
-    return feat_range_dict
-    
+    # Split on the first colon only, so values containing ':' survive.
+    return {key: float(value)
+            for key, value in (item.split(':', 1) for item in string_array)}
+
 def convert_string_array_to_dict_of_lists(string_array):
-    object_centers_dict = {}
-    for item in string_array:
-        key, value = item.split(':')
-        # Use ast.literal_eval to safely evaluate the string as a Python list
-        object_centers_dict[key] = ast.literal_eval(value)
-    return object_centers_dict
+    return {key: convert_string_to_appropriate_type(value)
+            for key, value in (item.split(':', 1) for item in string_array)}
     
 def get_parameter_as_dict(string_array):
     """
@@ -58,10 +109,28 @@ def get_parameter_as_dict(string_array):
 def convert_string_to_appropriate_type(value_str):
     """
     Attempt to convert a string to its appropriate Python type.
+
+    The common cases (numbers and lists) take cheap fast paths through
+    int/float/json.loads; only exotic literals pay for ast.literal_eval.
     """
+    v = value_str.strip()
+    if v[:1] in '[{':
+        try:
+            return json.loads(v.replace("'", '"'))
+        except ValueError:
+            pass
+    else:
+        try:
+            return int(v)
+        except ValueError:
+            pass
+        try:
+            return float(v)
+        except ValueError:
+            pass
     try:
-        # Try to evaluate the string as a Python literal (e.g., list, dict, int, float, bool, None)
-        return ast.literal_eval(value_str)
+        # Last resort: evaluate the string as a Python literal (e.g., bool, None, tuple)
+        return ast.literal_eval(v)
     except (ValueError, SyntaxError):
         # If evaluation fails, return the string as is
         return value_str
@@ -83,40 +152,43 @@ class TestVel(Node):
         """
 		Loading parameters and setting up variables from the ROS environment.
 		"""
-        # Declare parameters
-        self.declare_parameter('setup.prefix', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.model_filename', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.object_centers', descriptor=ParameterDescriptor(dynamic_typing=True))  # Declaring object_centers as a map
-        self.declare_parameter('setup.feat_list', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.feat_weights', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.start', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.goal', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.goal_pose', None, descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.T', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.timestep', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.save_dir', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.INTERACTION_TORQUE_THRESHOLD', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.INTERACTION_TORQUE_EPSILON', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.FEAT_RANGE', descriptor=ParameterDescriptor(dynamic_typing=True))  # Declaring FEAT_RANGE as a map
-        self.declare_parameter('setup.LF_dict', descriptor=ParameterDescriptor(dynamic_typing=True))  # Declaring LF_dict as a map
-        self.declare_parameter('setup.CONFIDENCE_THRESHOLD', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.N_QUERIES', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.nb_layers', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('setup.nb_units', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('planner.type', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('planner.max_iter', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('planner.num_waypts', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('controller.type', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('controller.p_gain', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('controller.i_gain', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('controller.d_gain', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('controller.epsilon', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('controller.max_cmd', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('learner.type', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('learner.step_size', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('learner.alpha', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('learner.n', descriptor=ParameterDescriptor(dynamic_typing=True))
-        self.declare_parameter('learner.P_beta', descriptor=ParameterDescriptor(dynamic_typing=True))  # Declaring P_beta as a map
+        # Declare parameters, sharing a single dynamic-typing descriptor
+        # instead of constructing one per declaration.
+        dyn_desc = ParameterDescriptor(dynamic_typing=True)
+        self.declare_parameter('setup.prefix', descriptor=dyn_desc)
+        self.declare_parameter('setup.model_filename', descriptor=dyn_desc)
+        self.declare_parameter('setup.object_centers', descriptor=dyn_desc)  # Declaring object_centers as a map
+        self.declare_parameter('setup.feat_list', descriptor=dyn_desc)
+        self.declare_parameter('setup.feat_weights', descriptor=dyn_desc)
+        self.declare_parameter('setup.start', descriptor=dyn_desc)
+        self.declare_parameter('setup.goal', descriptor=dyn_desc)
+        self.declare_parameter('setup.goal_pose', None, descriptor=dyn_desc)
+        self.declare_parameter('setup.T', descriptor=dyn_desc)
+        self.declare_parameter('setup.timestep', descriptor=dyn_desc)
+        self.declare_parameter('setup.save_dir', descriptor=dyn_desc)
+        self.declare_parameter('setup.INTERACTION_TORQUE_THRESHOLD', descriptor=dyn_desc)
+        self.declare_parameter('setup.INTERACTION_TORQUE_EPSILON', descriptor=dyn_desc)
+        self.declare_parameter('setup.FEAT_RANGE', descriptor=dyn_desc)  # Declaring FEAT_RANGE as a map
+        self.declare_parameter('setup.LF_dict', descriptor=dyn_desc)  # Declaring LF_dict as a map
+        self.declare_parameter('setup.CONFIDENCE_THRESHOLD', descriptor=dyn_desc)
+        self.declare_parameter('setup.N_QUERIES', descriptor=dyn_desc)
+        self.declare_parameter('setup.nb_layers', descriptor=dyn_desc)
+        self.declare_parameter('setup.nb_units', descriptor=dyn_desc)
+        self.declare_parameter('planner.type', descriptor=dyn_desc)
+        self.declare_parameter('planner.max_iter', descriptor=dyn_desc)
+        self.declare_parameter('planner.num_waypts', descriptor=dyn_desc)
+        self.declare_parameter('controller.type', descriptor=dyn_desc)
+        self.declare_parameter('controller.p_gain', descriptor=dyn_desc)
+        self.declare_parameter('controller.i_gain', descriptor=dyn_desc)
+        self.declare_parameter('controller.d_gain', descriptor=dyn_desc)
+        self.declare_parameter('controller.epsilon', descriptor=dyn_desc)
+        self.declare_parameter('controller.max_cmd', descriptor=dyn_desc)
+        self.declare_parameter('controller.min_dt', descriptor=dyn_desc)
+        self.declare_parameter('learner.type', descriptor=dyn_desc)
+        self.declare_parameter('learner.step_size', descriptor=dyn_desc)
+        self.declare_parameter('learner.alpha', descriptor=dyn_desc)
+        self.declare_parameter('learner.n', descriptor=dyn_desc)
+        self.declare_parameter('learner.P_beta', descriptor=dyn_desc)  # Declaring P_beta as a map
 
 
         # ----- General Setup ----- #
@@ -168,6 +240,14 @@ class TestVel(Node):
         self.joint_names = None
         self.initial_joint_positions = None
 
+        # Preallocated /joint_states scratch space. The driver reports
+        # joints rolled by one relative to the kinematic order, so apply
+        # a fixed index permutation instead of copying with np.roll on
+        # every callback.
+        self._perm = np.roll(np.arange(self.num_dofs), 1)
+        self._pos_buf = np.empty(self.num_dofs)
+        self._vel_buf = np.empty(self.num_dofs)
+
         # Track if you have reached the start/goal of the path.
         self.reached_start = False
         self.reached_goal = False
@@ -213,11 +293,16 @@ class TestVel(Node):
         # Retrieve controller specific parameters.
         controller_type = self.get_parameter('controller.type').value
         if controller_type == "pid":
-            # P, I, D gains.
-            # TODO: Change np.eye(7) to correct arm dofs.
-            P = self.get_parameter('controller.p_gain').value * np.ones((self.num_dofs, 1))
-            I = self.get_parameter('controller.i_gain').value * np.ones((self.num_dofs, 1))
-            D = self.get_parameter('controller.d_gain').value * np.ones((self.num_dofs, 1))
+            # P, I, D gains as flat float32 vectors, computed once here
+            # so the controller never has to reshape or broadcast them.
+            P = np.full(self.num_dofs, float(self.get_parameter('controller.p_gain').value), dtype=np.float32)
+            I = np.full(self.num_dofs, float(self.get_parameter('controller.i_gain').value), dtype=np.float32)
+            D = np.full(self.num_dofs, float(self.get_parameter('controller.d_gain').value), dtype=np.float32)
+
+            # The numba specialization of the PID step relies on these
+            # shapes and dtypes staying fixed.
+            for gain in (P, I, D):
+                assert gain.shape == (self.num_dofs,) and gain.dtype == np.float32
 
             # Stores proximity threshold.
             epsilon = self.get_parameter('controller.epsilon').value
@@ -225,7 +310,12 @@ class TestVel(Node):
             # Stores maximum COMMANDED joint torques.
             MAX_CMD = self.get_parameter('controller.max_cmd').value
 
-            self.controller = PIDController(P, I, D, epsilon, MAX_CMD)
+            # Steps shorter than this hold the previous command.
+            min_dt = self.get_parameter('controller.min_dt').value
+            if min_dt is None:
+                min_dt = 1e-4
+
+            self.controller = PIDController(P, I, D, epsilon, MAX_CMD, min_dt)
             # TODO: Implement PIDController class.
         else:
             raise Exception('Controller {} not implemented.'.format(controller_type))
@@ -233,7 +323,12 @@ class TestVel(Node):
         # Planner tells controller what plan to follow.
         self.controller.set_trajectory(self.traj)
 
-        self.cmd = np.zeros((self.num_dofs, self.num_dofs))
+        self.cmd = np.zeros(self.num_dofs)
+
+        # Reused velocity-command message with a fixed-size buffer;
+        # publish_trajectory overwrites the elements in place.
+        self._traj_msg = Float64MultiArray()
+        self._traj_msg.data = [0.0] * self.num_dofs
 
         # ----- Learner Setup ----- #
         constants = {}
@@ -247,19 +342,33 @@ class TestVel(Node):
         # Compliance parameters
         self.Kp = 1.0  # Stiffness (inverse of compliance)
         self.Kd = 0.1  # Damping
+        self._inv_Kp = 1.0 / self.Kp
 
         self.current_twist = TwistStamped()  # Keep track of the current twist for damping effect
+        # Previous twist as ndarrays so the compliance law can run as
+        # two length-3 vector ops instead of six attribute chains.
+        self._prev_lin = np.zeros(3)
+        self._prev_ang = np.zeros(3)
 
         # TF Buffer and Listener to get transformations
         self.tf_buffer = Buffer()
         self.tf_listener = TransformListener(self.tf_buffer, self)
+
+        # (stamp, matrix) cache for the wrench transform; TF updates at
+        # most ~100 Hz, so most 500 Hz ticks can reuse the last matrix.
+        self._rot_cache = (None, None)
         
 
-        # Set the rate to 500 Hz
-        self.wrench_timer = self.create_timer(1.0 / 500.0, self.timer_callback)
+        # Run the compliance loop at 500 Hz on a dedicated spin-lock
+        # thread; executor timers have multi-millisecond jitter against
+        # this 2 ms budget.
+        self.wrench_period = 1.0 / 500.0
 
         self.latest_wrench = None
 
+        self.wrench_thread = threading.Thread(target=self._wrench_loop, daemon=True)
+        self.wrench_thread.start()
+
         self.new_plan_timer = None # self.create_timer(0.2, self.new_plan_callback)
         self.begin_motion_timer = None
         self.can_move = True
@@ -315,6 +424,24 @@ class TestVel(Node):
         self.latest_wrench = msg
 
 
+    def _wrench_loop(self):
+        """
+        Drive timer_callback at a stable 500 Hz by busy-waiting on
+        perf_counter. If a tick overruns its slot by more than one
+        period, drop frames instead of trying to catch up.
+        """
+        period = self.wrench_period
+        next_t = time.perf_counter() + period
+        while rclpy.ok():
+            while time.perf_counter() < next_t:
+                pass
+            next_t += period
+            now = time.perf_counter()
+            if now > next_t + period:
+                next_t = now + period
+            self.timer_callback()
+
+
     def timer_callback(self):
         if self.latest_wrench is not None:
             try:
@@ -322,40 +449,41 @@ class TestVel(Node):
                 ft_to_tool0 = self.tf_buffer.lookup_transform('tool0', self.latest_wrench.header.frame_id, rclpy.time.Time())
                 # tool0_to_base_link = self.tf_buffer.lookup_transform('base_link', 'tool0', rclpy.time.Time())
 
-                # Transform the force/torque from ft_frame to tool0
-                force = self.transform_vector(ft_to_tool0, self.latest_wrench.wrench.force)
-                torque = self.transform_vector(ft_to_tool0, self.latest_wrench.wrench.torque)
-
-                # Transform the force/torque from tool0 to base_link
-                # force = self.transform_vector(tool0_to_base_link, force)
-                # torque = self.transform_vector(tool0_to_base_link, torque)
-
-                # Nullify force/torque readings with magnitude < 3
-                self.curr_force = self.nullify_small_magnitudes(force, 3.0)
-                torque = self.nullify_small_magnitudes(torque, 3.0)
-
-                if math.sqrt(self.curr_force.x ** 2 + self.curr_force.y ** 2 + self.curr_force.z ** 2) < 3.0:
+                # Build the rotation matrix once per TF update and reuse
+                # it for both vectors and across ticks that see the same
+                # transform stamp.
+                stamp = (ft_to_tool0.header.stamp.sec, ft_to_tool0.header.stamp.nanosec)
+                if stamp != self._rot_cache[0]:
+                    q = ft_to_tool0.transform.rotation
+                    self._rot_cache = (stamp, R.from_quat([q.x, q.y, q.z, q.w]).as_matrix())
+                Rm = self._rot_cache[1]
+
+                # Rotate, filter and apply the compliance law in a
+                # single kernel call; only message assembly and ROS I/O
+                # stay on the Python side.
+                wrench = self.latest_wrench.wrench
+                active, fx, fy, fz = _wrench_step(
+                    Rm, wrench.force.x, wrench.force.y, wrench.force.z,
+                    wrench.torque.x, wrench.torque.y, wrench.torque.z,
+                    self._prev_lin, self._prev_ang,
+                    self._inv_Kp, self.Kd, _FT_THRESH_SQ)
+                if not active:
+                    self.curr_force = _ZERO_VEC3
                     self.interaction = False
                     self.can_move = True
                     return
+                self.curr_force = Vector3(x=fx, y=fy, z=fz)
                 self.interaction = True
                 self.can_move = False
-                self.cmd = np.zeros((self.num_dofs, self.num_dofs))
-
-
+                self.cmd = np.zeros(self.num_dofs)
 
                 # Compute the twist in base_link frame
                 twist = TwistStamped()
                 twist.header.stamp = self.get_clock().now().to_msg()
                 twist.header.frame_id = 'tool0'
 
-                twist.twist.linear.x = (1 / self.Kp) * self.curr_force.x - self.Kd * self.current_twist.twist.linear.x
-                twist.twist.linear.y = (1 / self.Kp) * self.curr_force.y - self.Kd * self.current_twist.twist.linear.y
-                twist.twist.linear.z = (1 / self.Kp) * self.curr_force.z - self.Kd * self.current_twist.twist.linear.z
-
-                twist.twist.angular.x = (1 / self.Kp) * torque.x - self.Kd * self.current_twist.twist.angular.x
-                twist.twist.angular.y = (1 / self.Kp) * torque.y - self.Kd * self.current_twist.twist.angular.y
-                twist.twist.angular.z = (1 / self.Kp) * torque.z - self.Kd * self.current_twist.twist.angular.z
+                twist.twist.linear.x, twist.twist.linear.y, twist.twist.linear.z = self._prev_lin
+                twist.twist.angular.x, twist.twist.angular.y, twist.twist.angular.z = self._prev_ang
 
                 # Update the current twist for the next callback
                 self.current_twist = twist
@@ -367,26 +495,12 @@ class TestVel(Node):
                 self.get_logger().warn(f"Could not transform wrench to base_link frame: {str(e)}")
 
 
-    def transform_vector(self, transform, vector):
-        # Extract rotation (quaternion) and translation from TransformStamped
-        q = transform.transform.rotation
-
-        # Convert quaternion to rotation matrix using scipy
-        r = R.from_quat([q.x, q.y, q.z, q.w])
-
-        # Convert Vector3 to numpy array for easy multiplication
-        vector_np = np.array([vector.x, vector.y, vector.z])
-
-        # Apply the rotation
-        rotated_vector = r.apply(vector_np)
-
-        # Return the transformed vector as a Vector3
-        return Vector3(x=rotated_vector[0], y=rotated_vector[1], z=rotated_vector[2])
-
     def nullify_small_magnitudes(self, vector, threshold):
         magnitude = math.sqrt(vector.x ** 2 + vector.y ** 2 + vector.z ** 2)
-        if magnitude < threshold or np.isnan(magnitude):
-            return Vector3(x=0.0, y=0.0, z=0.0)
+        # magnitude != magnitude is the IEEE-754 NaN check; it avoids a
+        # NumPy ufunc dispatch on a plain Python float.
+        if magnitude < threshold or magnitude != magnitude:
+            return _ZERO_VEC3
         else:
             return vector
 
@@ -395,7 +509,6 @@ class TestVel(Node):
         """
         Set up all the subscribers and publishers needed.
         """
-        self.traj_timer = self.create_timer(0.1, self.publish_trajectory)
         self.trajectory_pub = self.create_publisher(JointTrajectory, '/scaled_joint_trajectory_controller/joint_trajectory', 10)
         self.vel_trajectory_pub = self.create_publisher(JointTrajectory, '/scaled_vel_joint_trajectory_controller/joint_trajectory', 10)
         self.vel_pub = self.create_publisher(Float64MultiArray, '/forward_velocity_controller/commands', 10)
@@ -437,7 +550,7 @@ class TestVel(Node):
                 if self.interaction_mode == False:
                     self.interaction_mode = True
                     self.can_move = False
-                    self.cmd = np.zeros((self.num_dofs, self.num_dofs))
+                    self.cmd = np.zeros(self.num_dofs)
 
         else:
             self.get_logger().info(f'No interaction')
@@ -554,16 +667,15 @@ class TestVel(Node):
             self.initial_joint_positions = np.roll(np.array(msg.position),1)
             self.joint_positions = self.initial_joint_positions
 
-        curr_pos = np.roll(np.array(msg.position),1).reshape(self.num_dofs,1)
+        np.take(msg.position, self._perm, out=self._pos_buf)
+        np.take(msg.velocity, self._perm, out=self._vel_buf)
+        curr_pos = self._pos_buf
         # curr_pos_str = np.array2string(curr_pos)
         # self.get_logger().info(f"curr_pos: {curr_pos_str}")
 
-        # Convert to radians.
-        curr_pos = curr_pos
-        
         # When no in feature learning stage, update position.
         self.curr_pos = curr_pos
-        self.curr_vel = np.roll(np.array(msg.velocity),1).reshape(self.num_dofs,1)
+        self.curr_vel = self._vel_buf
 
         # Update cmd from PID based on current position.
         self.cmd = self.controller.get_command(self.curr_pos, self.curr_vel)
@@ -574,6 +686,10 @@ class TestVel(Node):
         if self.controller.path_end_T is not None:
             self.reached_goal = True
 
+        # Publish at message rate rather than from a separate timer, so
+        # the command goes out as soon as it is computed.
+        self.publish_trajectory()
+
 
     def publish_trajectory(self):
         if self.initial_joint_positions is None:
@@ -581,12 +697,11 @@ class TestVel(Node):
         # self.get_logger().info(f'im: {self.interaction_mode}, cm: {self.can_move}, flm: {self.feature_learning_mode}')
         if not self.interaction_mode and self.can_move and not self.feature_learning_mode:
             # self.get_logger().info('Publishing trajectory')
-            joint_vel = np.array([self.cmd[i][i] for i in range(len(self.joint_names))]) 
-            
-            # Float64MultiArray
-            traj_msg = Float64MultiArray()
-            traj_msg.data = joint_vel
-            self.vel_pub.publish(traj_msg)
+            data = self._traj_msg.data
+            cmd = self.cmd
+            for i in range(self.num_dofs):
+                data[i] = float(cmd[i])
+            self.vel_pub.publish(self._traj_msg)
 
 
 def main(args=None):
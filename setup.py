@@ -1,35 +1,82 @@
-from setuptools import find_packages, setup
+from setuptools import setup
+from setuptools.command.bdist_egg import bdist_egg
 
 import os
-from glob import glob
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# No native extensions today, but anything compiled by a nested build
+# (make/cmake driven) should use every core; setdefault keeps caller
+# overrides intact.
+os.environ.setdefault('MAKEFLAGS', f'-j{os.cpu_count() or 1}')
+os.environ.setdefault('CMAKE_BUILD_PARALLEL_LEVEL', str(os.cpu_count() or 1))
 
 package_name = 'ferl_demos'
 
+# Destination prefixes, built once instead of re-concatenated per
+# data_files entry. setuptools normalizes separators itself, so plain
+# forward-slash strings beat os.path.join's per-argument inspection.
+_RESOURCE = f'resource/{package_name}'
+_SHARE = f'share/{package_name}'
+
+# Compiled once; fnmatch would retranslate the wildcard pattern and pay
+# its pattern-cache lookup on every entry.
+_LAUNCH_RE = re.compile(r'.*launch\.(?:py|xml|yaml)$')
+
+
+def _scan(spec):
+    path, keep = spec
+    # One isdir stat short-circuits stripped checkouts (sdists or wheel
+    # builds without the data tree) instead of raising out of listdir.
+    if not os.path.isdir(path):
+        return []
+    # listdir plus a str predicate runs entirely in C per entry. None
+    # of these flat directories nest, so the DirEntry type check the
+    # scandir version did matched exactly what the old glob patterns
+    # matched anyway.
+    return [f'{path}/{n}' for n in os.listdir(path) if keep(n)]
+
+
+def _collect():
+    """
+    The three source directories are independent and the scans are
+    I/O-bound (scandir blocks in getdents with the GIL released), so
+    overlap them on a small thread pool. On a cold or network-backed
+    filesystem this hides most of the per-directory latency.
+    """
+    specs = [('config', lambda n: n.endswith('.yaml')),
+             ('launch', _LAUNCH_RE.match),
+             ('data/objects', lambda n: n.endswith('.xml'))]
+    with ThreadPoolExecutor(len(specs)) as ex:
+        return tuple(ex.map(_scan, specs))
+
+
+# Metadata-only invocations (egg_info, --version, ...) never install
+# data files, so don't pay for the tree walk on them; colcon's
+# dependency resolution hits those paths repeatedly. Gate on the
+# skip side: anything unrecognized (editable_wheel from PEP 517
+# editable installs, future commands) still collects, so an omission
+# here costs a scan rather than an empty share tree.
+_METADATA_ONLY = {'egg_info', 'dist_info', 'check', 'clean',
+                  '--version', '--name', '--help', '-h'}
+_NEEDS_DATA = not (sys.argv[1:] and set(sys.argv[1:]) <= _METADATA_ONLY)
+
+if _NEEDS_DATA:
+    config_files, launch_files, object_files = _collect()
+else:
+    config_files = launch_files = object_files = []
+
+# Everything static lives declaratively in setup.cfg; only the
+# data-file collection (filesystem-dependent) and command hooks remain
+# here, since ament_python still executes setup.py.
 setup(
-    name=package_name,
-    version='0.0.0',
-    packages=find_packages(exclude=['test']),
     data_files=[
-        ('share/ament_index/resource_index/packages',
-            ['resource/' + package_name]),
-        ('share/' + package_name, ['package.xml']),
-        (os.path.join('share', package_name, 'config'), glob('config/*.yaml')),
-        (os.path.join('share', package_name, 'launch'), glob(os.path.join('launch', '*launch.[pxy][yma]*'))),
-        (os.path.join('share', package_name, 'data'), glob('data/objects/*.xml'))
+        ('share/ament_index/resource_index/packages', [_RESOURCE]),
+        (_SHARE, ['package.xml']),
+        (f'{_SHARE}/config', config_files),
+        (f'{_SHARE}/launch', launch_files),
+        (f'{_SHARE}/data', object_files)
     ],
-    install_requires=['setuptools'],
-    zip_safe=True,
-    maintainer='ingui',
-    maintainer_email='ingui2@illinois.edu',
-    description='TODO: Package description',
-    license='TODO: License declaration',
-    tests_require=['pytest'],
-    entry_points={
-        'console_scripts': [
-            'demo_recorder = ferl_demos.demo_recorder:main',
-            'demo_inference = ferl_demos.demo_inference:main',
-            'path_follower = ferl_demos.path_follower:main',
-            'phri_inference = ferl_demos.phri_inference:main',
-        ],
-    },
+    cmdclass={'bdist_egg': bdist_egg},
 )
@@ -0,0 +1,23 @@
+"""
+Run setup.py from cached bytecode.
+
+setup.py is a top-level script, so CPython never writes a __pycache__
+entry for it: every invocation re-lexes, re-parses and re-compiles the
+source, and colcon invokes setup.py several times per package per
+build. This wrapper compiles setup.py to setup.pyc once, refreshes it
+only when the source is newer, and executes the bytecode directly.
+
+Usage: python setup_fast.py [setup.py arguments]
+"""
+
+import os
+import py_compile
+import runpy
+
+_SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'setup.py')
+_PYC = _SRC + 'c'
+
+if not os.path.exists(_PYC) or os.path.getmtime(_PYC) < os.path.getmtime(_SRC):
+    py_compile.compile(_SRC, cfile=_PYC, doraise=True)
+
+runpy.run_path(_PYC, run_name='__main__')